@@ -0,0 +1,365 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from flashcardCore import (
+    DECK_ID, DatabaseManager, DeckRepository, DistractorEngine, QuizSampler, QuizSession,
+    ReviewLogWriter, ReviewScheduler, SchemaMigrator, SearchEngine, atomic_write_json, ensure_deck
+)
+
+
+# Pomiary wydajności na syntetycznych taliach w bazie SQLite (bez Qt), np.:
+# python benchmark.py --size medium --output wyniki.json --baseline benchmark_baseline.json
+SIZES = {"small": 10 ** 4, "medium": 10 ** 5, "large": 10 ** 6}
+LANGUAGES = ["Angielski", "Hiszpański", "Francuski", "Niemiecki", "Włoski", "Portugalski", "Rosyjski", "Japoński"]
+SUBCATEGORIES = ["rzeczowniki", "czasowniki", "przymiotniki", "zwroty", "liczby", "jedzenie", "podróże", "praca"]
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "te", "vo", "ba", "di", "fu", "go", "hi", "ja", "ko",
+             "la", "ma", "no", "pa", "ri", "so", "tu", "wa", "ze", "bri", "tra", "ste", "plo", "gra", "che"]
+# Sylaby tłumaczeń z polskimi znakami - wyszukiwanie musi je sprowadzać do liter bazowych
+TRANSLATION_SYLLABLES = ["ża", "ło", "mię", "ść", "ką", "po", "rze", "dź", "wo", "si", "ół", "na", "te", "bę",
+                         "cy", "go", "ni", "ja", "le", "mu", "źre", "gę", "ko", "ta", "wy", "zo", "de", "fa"]
+
+
+# Powtarzalny generator danych: języki × podkategorie × użytkownicy, fiszki rozłożone po równo
+# na wszystkie talie. Ten sam seed daje te same słowa, tłumaczenia i historię odpowiedzi.
+class SyntheticDeckGenerator:
+    def __init__(self, cards, languages=4, subcategories=5, users=10, answers=None, seed=42):
+        self.cards = cards
+        self.languages = LANGUAGES[:languages]
+        self.subcategories = SUBCATEGORIES[:subcategories]
+        self.users = users
+        # Historia odpowiedzi pierwszego użytkownika (do tabel postępów)
+        self.answers = min(cards // 2, 20000) if answers is None else answers
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def params(self):
+        return {
+            "cards": self.cards,
+            "languages": len(self.languages),
+            "subcategories": len(self.subcategories),
+            "users": self.users,
+            "answers": self.answers,
+            "seed": self.seed
+        }
+
+    def decks(self):
+        return [(language, subcategory) for language in self.languages for subcategory in self.subcategories]
+
+    def pseudo_word(self, syllables):
+        return "".join(self.rng.choice(syllables) for _ in range(self.rng.randint(2, 4)))
+
+    def deck_cards(self, count):
+        # Słowa w talii są unikalne (indeks unikalny na talię)
+        words = set()
+        while len(words) < count:
+            words.add(self.pseudo_word(SYLLABLES))
+        for word in sorted(words):
+            translation = self.pseudo_word(TRANSLATION_SYLLABLES)
+            yield word, translation, f"{word.capitalize()} to po polsku {translation}."
+
+    def rows(self):
+        # (język, podkategoria, słowo, tłumaczenie, zdanie, użytkownik, klucz losowania)
+        decks = [(user_id, deck) for user_id in range(1, self.users + 1) for deck in self.decks()]
+        per_deck, extra = divmod(self.cards, len(decks))
+        for position, (user_id, (category, subcategory)) in enumerate(decks):
+            for word, translation, sentence in self.deck_cards(per_deck + (1 if position < extra else 0)):
+                yield category, subcategory, word, translation, sentence, user_id, self.rng.random()
+
+    def populate(self, db_manager):
+        SchemaMigrator(db_manager).migrate()
+        db_manager.execute_many(
+            "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+            [(f"user{user_id}", f"user{user_id}@example.com", "haslo") for user_id in range(1, self.users + 1)]
+        )
+        deck_ids = {deck: ensure_deck(db_manager, *deck) for deck in self.decks()}
+        db_manager.execute_many(
+            "INSERT INTO flashcards (deck_id, word, translation, example_sentence, user_id, random_key) "
+            "VALUES (%s, %s, %s, %s, %s, %s)", ((deck_ids[row[:2]],) + row[2:] for row in self.rows()), 5000
+        )
+        self.populate_history(db_manager)
+
+    def populate_history(self, db_manager):
+        # Odpowiedzi pierwszego użytkownika z ostatnich 90 dni, w kolejności czasu (serie dni w agregatach)
+        card_ids = db_manager.fetch_all(
+            "SELECT f.id, l.name, d.name FROM flashcards f JOIN decks d ON d.id = f.deck_id "
+            "JOIN languages l ON l.id = d.language_id WHERE f.user_id = 1"
+        )
+        if not card_ids or not self.answers:
+            return
+        now = time.time()
+        moments = sorted(now - self.rng.random() * 90 * 24 * 3600 for _ in range(self.answers))
+        writer = ReviewLogWriter(db_manager, max_pending=self.answers + 100)
+        for answered_at in moments:
+            card_id, category, subcategory = self.rng.choice(card_ids)
+            writer.log_answer(1, card_id, (category, subcategory), self.rng.random() < 0.7,
+                              self.rng.randint(800, 9000), self.rng.choice(("open", "abcd")), answered_at)
+        writer.close(timeout=600)
+
+
+def measure(action, repeat, setup=None):
+    # Mediana z kilku przebiegów; setup(run) przygotowuje dane poza pomiarem czasu
+    times = []
+    for run in range(repeat):
+        argument = setup(run) if setup is not None else None
+        started = time.perf_counter()
+        action(argument)
+        times.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "max_ms": round(max(times), 3),
+        "runs": repeat
+    }
+
+
+DATASET_FILES = ("benchmark.sqlite",)
+
+
+def run_benchmarks(data_dir, repeat, seed):
+    # Pomiary zmieniają dane (quiz przelosowuje klucze, CRUD dodaje fiszki), więc działają na kopii
+    source_dir, data_dir = data_dir, os.path.join(data_dir, "run")
+    shutil.rmtree(data_dir, ignore_errors=True)
+    os.makedirs(data_dir)
+    for name in DATASET_FILES:
+        shutil.copy(os.path.join(source_dir, name), data_dir)
+    random.seed(seed)
+    rng = random.Random(seed)
+    db_manager = DatabaseManager(None, None, None, os.path.join(data_dir, "benchmark.sqlite"), driver="sqlite")
+    # Dane wygenerowane wcześniej mogą mieć starszy schemat
+    SchemaMigrator(db_manager).migrate()
+    writer = ReviewLogWriter(db_manager)
+    repository = DeckRepository(db_manager, SearchEngine(db_manager))
+    repository.load_decks()
+    sampler = QuizSampler(db_manager)
+    user_id = 1
+    decks = [tuple(deck) for deck in db_manager.fetch_all(
+        "SELECT l.name, d.name FROM decks d JOIN languages l ON l.id = d.language_id "
+        "WHERE EXISTS (SELECT 1 FROM flashcards f WHERE f.deck_id = d.id AND f.user_id = %s) ORDER BY l.name, d.name",
+        (user_id,)
+    )]
+    first_deck = decks[0]
+    samples = rng.sample(db_manager.fetch_all(
+        "SELECT word, translation FROM flashcards WHERE user_id = %s ORDER BY id", (user_id,)
+    ), 100)
+    results = {}
+
+    def load_decks(_):
+        DeckRepository(db_manager).load_decks()
+
+    results["load_decks"] = measure(load_decks, repeat)
+
+    def build_index(_):
+        SearchEngine(db_manager).index_for(user_id)
+
+    def search_words(_):
+        # Całe słowa, prefiksy i tłumaczenia bez polskich znaków
+        for word, translation in samples:
+            repository.search_engine.search(user_id, word)
+            repository.search_engine.search(user_id, word[:3])
+            repository.search_engine.search(user_id, translation.replace("ł", "l").replace("ż", "z"))
+
+    results["search_index_build"] = measure(build_index, repeat)
+    repository.search_engine.index_for(user_id)
+    results["search_300_queries"] = measure(search_words, repeat)
+
+    def start_quiz(mode):
+        def action(_):
+            session = QuizSession(sampler, ReviewScheduler(db_manager, user_id, writer), writer, mode)
+            session.start(decks, 20)
+        return action
+
+    results["quiz_start_open"] = measure(start_quiz(QuizSession.MODE_OPEN), repeat)
+    results["quiz_start_abcd"] = measure(start_quiz(QuizSession.MODE_ABCD), repeat)
+
+    translations = sampler.sample_translations(user_id, decks, 2000)
+    engine = DistractorEngine(translations)
+
+    def build_distractors(_):
+        DistractorEngine(translations)
+
+    def abcd_options(_):
+        for translation in translations[:1000]:
+            engine.options(translation)
+
+    results["abcd_engine_build_2000"] = measure(build_distractors, repeat)
+    results["abcd_options_1000"] = measure(abcd_options, repeat)
+
+    def refresh_progress(_):
+        writer.flush(5.0)
+        repository.progress_summary(user_id)
+        repository.deck_progress(user_id)
+        repository.daily_progress(user_id, None, 30)
+
+    results["progress_refresh"] = measure(refresh_progress, repeat)
+
+    # Pierwsza strona tabeli fiszek (jak FlashcardTableModel) przy przełączaniu kolejno wszystkich talii
+    page_query = f"""
+    SELECT id, word, translation, COALESCE(example_sentence, '')
+    FROM flashcards
+    WHERE deck_id = {DECK_ID} AND user_id = %s
+    ORDER BY word ASC, id ASC LIMIT 200
+    """
+
+    def switch_decks(fetch):
+        def action(_):
+            for category, subcategory in decks:
+                fetch((user_id, category, subcategory), page_query, (category, subcategory, user_id))
+        return action
+
+    def warm_cache(_):
+        repository.deck_cache.clear()
+        switch_decks(repository.deck_cache.fetch_all)(None)
+
+    results["deck_switch"] = measure(switch_decks(lambda deck, query, params: db_manager.fetch_all(query, params)),
+                                     repeat)
+    results["deck_switch_cached"] = measure(switch_decks(repository.deck_cache.fetch_all), repeat, warm_cache)
+
+    def crud_words(run):
+        return [f"benchmark{run}-{i}" for i in range(100)]
+
+    def add_cards(words):
+        for word in words:
+            repository.add_card(user_id, first_deck[0], first_deck[1], word, "tłumaczenie", "")
+
+    def update_cards(words):
+        for word in words:
+            repository.update_card(user_id, first_deck[0], first_deck[1], word, word, "zmienione", "zdanie")
+
+    def delete_cards(words):
+        for word in words:
+            repository.delete_card(user_id, first_deck[0], first_deck[1], word)
+
+    results["crud_add_100"] = measure(add_cards, repeat, crud_words)
+    results["crud_update_100"] = measure(update_cards, repeat, crud_words)
+    results["crud_delete_100"] = measure(delete_cards, repeat, crud_words)
+
+    def batch_words(run):
+        return [f"batch{run}-{i}" for i in range(100)]
+
+    def add_cards_batch(words):
+        repository.add_cards(user_id, first_deck[0], first_deck[1], [(word, "tłumaczenie", "") for word in words])
+
+    def delete_cards_batch(words):
+        repository.delete_cards(user_id, first_deck[0], first_deck[1], words)
+
+    results["crud_add_batch_100"] = measure(add_cards_batch, repeat, batch_words)
+    results["crud_delete_batch_100"] = measure(delete_cards_batch, repeat, batch_words)
+
+    deck_file = os.path.join(data_dir, "import.tsv")
+    with open(deck_file, "w", encoding="utf-8") as file:
+        for i in range(1000):
+            file.write(f"import{i}\ttłumaczenie {i}\tZdanie {i}.\n")
+
+    def import_deck(run):
+        repository.import_file(user_id, first_deck[0], f"import-{run}", deck_file)
+
+    results["crud_import_1000"] = measure(import_deck, repeat)
+
+    writer.close()
+    db_manager.disconnect()
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Zwraca wiersze porównania i listę pomiarów wolniejszych od bazowych o więcej niż threshold
+    lines, regressions = [], []
+    for name in sorted(set(results) | set(baseline)):
+        current = results.get(name, {}).get("median_ms")
+        previous = baseline.get(name, {}).get("median_ms")
+        if current is None or previous is None:
+            lines.append(f"  {name:<26} {'-' if previous is None else f'{previous:.2f}':>12} "
+                         f"{'-' if current is None else f'{current:.2f}':>12}")
+            continue
+        change = (current - previous) / previous if previous else 0.0
+        marker = ""
+        if change > threshold:
+            marker = "  REGRESJA"
+            regressions.append(name)
+        elif change < -threshold:
+            marker = "  poprawa"
+        lines.append(f"  {name:<26} {previous:>12.2f} {current:>12.2f} {change * 100:>+8.1f}%{marker}")
+    return lines, regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Talkie - pomiary wydajności")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Liczba fiszek: 10^4, 10^5 lub 10^6")
+    parser.add_argument("--cards", type=int, default=None, help="Dokładna liczba fiszek (zamiast --size)")
+    parser.add_argument("--languages", type=int, default=4)
+    parser.add_argument("--subcategories", type=int, default=5)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=None, help="Katalog na dane (ponownie użyty, jeśli parametry się zgadzają)")
+    parser.add_argument("--output", default=None, help="Plik JSON z wynikami")
+    parser.add_argument("--baseline", default=None, help="Wyniki bazowe do porównania")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Próg regresji (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticDeckGenerator(
+        args.cards or SIZES[args.size], min(args.languages, len(LANGUAGES)),
+        min(args.subcategories, len(SUBCATEGORIES)), args.users, seed=args.seed
+    )
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="talkie-benchmark-")
+    os.makedirs(data_dir, exist_ok=True)
+    dataset_file = os.path.join(data_dir, "dataset.json")
+    dataset = None
+    if os.path.exists(dataset_file):
+        with open(dataset_file, "r", encoding="utf-8") as file:
+            dataset = json.load(file)
+    if dataset != generator.params():
+        for name in DATASET_FILES:
+            if os.path.exists(os.path.join(data_dir, name)):
+                os.remove(os.path.join(data_dir, name))
+        started = time.perf_counter()
+        db_manager = DatabaseManager(None, None, None, os.path.join(data_dir, "benchmark.sqlite"), driver="sqlite")
+        generator.populate(db_manager)
+        db_manager.disconnect()
+        atomic_write_json(dataset_file, generator.params())
+        print(f"Wygenerowano {generator.cards} fiszek w {time.perf_counter() - started:.1f} s ({data_dir})")
+    else:
+        print(f"Użyto istniejących danych z {data_dir}")
+
+    report = {
+        "dataset": generator.params(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform()
+        },
+        "results": run_benchmarks(data_dir, args.repeat, args.seed)
+    }
+    output = json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("dataset") != report["dataset"]:
+            print("Uwaga: wyniki bazowe zmierzono na innym zbiorze danych.")
+        lines, regressions = compare(report["results"], baseline.get("results", {}), args.threshold)
+        print(f"  {'pomiar (mediana ms)':<26} {'bazowy':>12} {'bieżący':>12} {'zmiana':>9}")
+        print("\n".join(lines))
+        if regressions and args.fail_on_regression:
+            exit_code = 1
+    else:
+        for name, result in sorted(report["results"].items()):
+            print(f"  {name:<26} {result['median_ms']:>12.2f} ms")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
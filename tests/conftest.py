@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# Moduły aplikacji leżą w katalogu głównym repozytorium, a testy GUI działają bez ekranu
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from flashcardCore import DatabaseManager, SchemaMigrator  # noqa: E402
+
+
+# Pusta baza SQLite w katalogu tymczasowym testu
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(None, None, None, str(tmp_path / "schema.sqlite"), driver="sqlite")
+    yield db
+    db.disconnect()
+
+
+# Baza z aktualnym schematem i dwoma użytkownikami (id 1 i 2)
+@pytest.fixture
+def migrated_db(db):
+    SchemaMigrator(db).migrate()
+    db.execute_query("INSERT INTO users (username, email, password) VALUES "
+                     "('ann', 'a@example.com', 'x'), ('bob', 'b@example.com', 'y')")
+    return db
@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+
+from flashcardCore import DatabaseManager
+
+
+# Zastępczy sterownik: SQLite za tym samym interfejsem, z możliwością zerwania połączenia
+class FlakyConnection:
+    def __init__(self, path):
+        self.inner = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.dropped = False
+        self.closed = False
+
+    def cursor(self):
+        if self.dropped:
+            raise sqlite3.OperationalError("server has gone away")
+        return self.inner.cursor()
+
+    def commit(self):
+        if self.dropped:
+            raise sqlite3.OperationalError("server has gone away")
+        self.inner.commit()
+
+    def rollback(self):
+        self.inner.rollback()
+
+    def close(self):
+        self.closed = True
+        self.inner.close()
+
+
+class FlakyDriver:
+    def __init__(self, path, failures=0):
+        self.path = path
+        self.failures = failures
+        self.connections = []
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("can't connect")
+        connection = FlakyConnection(self.path)
+        self.connections.append(connection)
+        return connection
+
+
+def make_manager(driver, **options):
+    options.setdefault("retry_backoff", 0)
+    return DatabaseManager(None, None, None, None, driver=driver, paramstyle="qmark", dialect="sqlite", **options)
+
+
+@pytest.fixture
+def driver(tmp_path):
+    return FlakyDriver(str(tmp_path / "pool.sqlite"))
+
+
+def test_reconnects_dropped_connection_on_checkout(driver):
+    db = make_manager(driver, pool_size=1, ping_interval=0)
+    db.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    db.execute_query("INSERT INTO items (name) VALUES (%s)", ("a",))
+    driver.connections[0].dropped = True
+
+    assert db.fetch_all("SELECT name FROM items") == [("a",)]
+    assert db.reconnects == 1
+    assert len(driver.connections) == 2
+    assert driver.connections[0].closed
+    assert db.pool_stats()["open"] == 1
+
+
+def test_retries_query_once_when_connection_drops_mid_use(driver):
+    # Bez sprawdzania przy pobraniu z puli - zerwanie wykrywa dopiero nieudane zapytanie
+    db = make_manager(driver, pool_size=1, ping_interval=3600)
+    db.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    driver.connections[0].dropped = True
+
+    assert db.insert("INSERT INTO items (name) VALUES (%s)", ("b",)) == 1
+    assert db.fetch_one("SELECT COUNT(*) FROM items") == (1,)
+    assert db.reconnects == 1
+
+
+def test_reconnect_backs_off_until_driver_recovers(driver):
+    driver.failures = 2
+    db = make_manager(driver, max_retries=3)
+
+    assert db.fetch_one("SELECT 1") == (1,)
+    assert len(driver.connections) == 1
+
+
+def test_gives_up_after_max_retries_and_frees_the_slot(driver):
+    driver.failures = 5
+    db = make_manager(driver, pool_size=1, max_retries=2)
+
+    assert db.fetch_one("SELECT 1") is None
+    assert db.pool_stats()["open"] == 0
+    # Kolejna próba może otworzyć połączenie, gdy sterownik znów działa
+    driver.failures = 0
+    assert db.fetch_one("SELECT 1") == (1,)
+
+
+def test_pool_reuses_connections_and_records_checkout_waits(driver):
+    db = make_manager(driver, pool_size=2)
+    for _ in range(5):
+        db.fetch_one("SELECT 1")
+
+    stats = db.pool_stats()
+    assert len(driver.connections) == 1
+    assert stats["checkouts"] == 5
+    assert stats["max_wait"] >= stats["avg_wait"] >= 0.0
@@ -0,0 +1,51 @@
+import pytest
+
+from flashcardCore import DeckImporter, DeckRepository, read_deck_file
+
+DECK = ("Angielski", "czasowniki")
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def deck_words(db):
+    return [row[0] for row in db.fetch_all("SELECT word FROM flashcards ORDER BY word")]
+
+
+def test_read_deck_file_handles_anki_headers_and_html(tmp_path):
+    path = write(tmp_path, "anki.txt", "#separator:Semicolon\n#html:true\n<b>run</b>;biegać\n;pusty\neat;jeść;I eat.;x\n")
+
+    assert list(read_deck_file(path)) == [("run", "biegać", ""), ("eat", "jeść", "I eat.")]
+
+
+def test_import_skips_existing_and_repeated_words(migrated_db, tmp_path):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, *DECK, "run", "biegać", "")
+    repository.add_card(2, *DECK, "eat", "jeść", "")
+    path = write(tmp_path, "talia.tsv", "run\tbiec\neat\tjeść\nwalk\tchodzić\nwalk\tspacerować\nswim\tpływać\n")
+
+    stats = repository.import_file(1, *DECK, path, chunk_size=2)
+
+    assert stats == {"read": 5, "inserted": 3, "skipped": 2}
+    assert migrated_db.fetch_all("SELECT user_id, word, translation FROM flashcards ORDER BY user_id, word") == [
+        (1, "eat", "jeść"), (1, "run", "biegać"), (1, "swim", "pływać"), (1, "walk", "chodzić"), (2, "eat", "jeść")
+    ]
+    # Indeks wyszukiwania i indeks fiszek talii widzą zaimportowane słowa
+    assert [card[2] for card in repository.search_engine.search(1, "swim")] == ["swim"]
+    assert repository.delete_card(1, *DECK, "swim")
+
+
+def test_bad_row_rolls_back_the_whole_import(migrated_db, tmp_path):
+    DeckRepository(migrated_db).add_card(1, *DECK, "run", "biegać", "")
+    migrated_db.execute_query("CREATE TRIGGER reject_bad BEFORE INSERT ON flashcards WHEN NEW.word = 'bad' "
+                              "BEGIN SELECT RAISE(ABORT, 'bad row'); END")
+    path = write(tmp_path, "talia.csv", "walk,chodzić\nswim,pływać\neat,jeść\nbad,zły\n")
+
+    with pytest.raises(RuntimeError):
+        DeckImporter(migrated_db, 1, *DECK, chunk_size=2).import_file(path)
+
+    assert deck_words(migrated_db) == ["run"]
+    assert not migrated_db.in_transaction()
@@ -0,0 +1,107 @@
+import pytest
+
+from flashcardCore import DECK_ID, DeckRepository
+
+DECK = ("Angielski", "czasowniki")
+OTHER = ("Angielski", "rzeczowniki")
+PAGE = f"SELECT word, translation FROM flashcards WHERE user_id = %s AND deck_id = {DECK_ID} ORDER BY word"
+
+
+@pytest.fixture
+def repository(migrated_db):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, *DECK, "run", "biegać", "")
+    repository.add_card(1, *OTHER, "book", "książka", "")
+    return repository
+
+
+# Strona talii przez pamięć podręczną, tak jak czyta ją model tabeli w oknie aplikacji
+def page(repository, deck, user_id=1):
+    return repository.deck_cache.fetch_all((user_id,) + deck, PAGE, (user_id,) + deck)
+
+
+def test_repeated_reads_are_served_from_the_cache(repository):
+    assert page(repository, DECK) == [("run", "biegać")]
+    repository.db_manager.execute_query("UPDATE flashcards SET translation = 'zmiana'")
+
+    # Zapis poza repozytorium nie unieważnia wyników - zwracana jest zapamiętana strona
+    assert page(repository, DECK) == [("run", "biegać")]
+    stats = repository.deck_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["rows"]) == (1, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_repository_writes_invalidate_only_their_deck(repository):
+    page(repository, DECK)
+    page(repository, OTHER)
+
+    repository.add_card(1, *DECK, "eat", "jeść", "")
+    assert repository.deck_cache.stats()["invalidations"] == 1
+    assert page(repository, DECK) == [("eat", "jeść"), ("run", "biegać")]
+
+    repository.update_card(1, *DECK, "run", "run", "pobiec", "")
+    assert page(repository, DECK) == [("eat", "jeść"), ("run", "pobiec")]
+
+    repository.delete_card(1, *DECK, "eat")
+    assert page(repository, DECK) == [("run", "pobiec")]
+
+    # Druga talia nie była zmieniana, więc jej strona wciąż pochodzi z pamięci
+    misses = repository.deck_cache.misses
+    assert page(repository, OTHER) == [("book", "książka")]
+    assert repository.deck_cache.misses == misses
+
+
+def test_invalidation_is_per_user(repository):
+    repository.add_card(2, *DECK, "walk", "chodzić", "")
+    assert page(repository, DECK, user_id=2) == [("walk", "chodzić")]
+    page(repository, DECK)
+
+    repository.add_card(1, *DECK, "eat", "jeść", "")
+    misses = repository.deck_cache.misses
+    assert page(repository, DECK, user_id=2) == [("walk", "chodzić")]
+    assert repository.deck_cache.misses == misses
+
+
+def test_clear_drops_entries_and_bumps_the_generation(repository):
+    cache = repository.deck_cache
+    page(repository, DECK)
+    page(repository, OTHER)
+    generation = cache._generation
+
+    cache.clear()
+    assert cache._generation == generation + 1
+    assert (cache.stats()["entries"], cache.stats()["rows"]) == (0, 0)
+    assert page(repository, DECK) == [("run", "biegać")]
+    assert cache.misses == 3
+
+
+def test_read_in_progress_is_not_stored_after_invalidation(repository):
+    # Wynik pobrany przed zapisem nie może trafić do pamięci po unieważnieniu talii
+    cache = repository.deck_cache
+    fetch_all = repository.db_manager.fetch_all
+
+    def fetch_then_write(query, params=()):
+        rows = fetch_all(query, params)
+        repository.add_card(1, *DECK, "eat", "jeść", "")
+        return rows
+
+    repository.db_manager.fetch_all = fetch_then_write
+    try:
+        assert page(repository, DECK) == [("run", "biegać")]
+    finally:
+        repository.db_manager.fetch_all = fetch_all
+    assert cache.stats()["entries"] == 0
+    assert page(repository, DECK) == [("eat", "jeść"), ("run", "biegać")]
+
+
+def test_oldest_entries_are_evicted_over_the_row_limit(repository):
+    cache = repository.deck_cache
+    cache.max_rows = 1
+    page(repository, DECK)
+    page(repository, OTHER)
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 1
+    misses = cache.misses
+    page(repository, OTHER)
+    assert cache.misses == misses
@@ -0,0 +1,59 @@
+from flashcardCore import DeckRepository
+
+DECK = ("Angielski", "czasowniki")
+
+
+def card_words(db):
+    return db.fetch_all("SELECT user_id, word FROM flashcards ORDER BY user_id, word")
+
+
+def add_answers(db, user_id, word):
+    card_id = db.fetch_one("SELECT id FROM flashcards WHERE user_id = %s AND word = %s", (user_id, word))[0]
+    db.execute_query("INSERT INTO review_state (user_id, card_id, due_at) VALUES (%s, %s, 0)", (user_id, card_id))
+    db.execute_query("INSERT INTO stats_card (user_id, card_id, answers) VALUES (%s, %s, 1)", (user_id, card_id))
+    db.execute_query("INSERT INTO stats_deck (user_id, deck_id, answers) "
+                     "SELECT %s, deck_id, 1 FROM flashcards WHERE id = %s", (user_id, card_id))
+
+
+def test_deleting_a_shared_deck_keeps_other_users_cards(migrated_db):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, *DECK, "run", "biegać", "")
+    repository.add_card(2, *DECK, "walk", "chodzić", "")
+    add_answers(migrated_db, 1, "run")
+    add_answers(migrated_db, 2, "walk")
+
+    assert repository.delete_subcategory(1, *DECK)
+
+    assert card_words(migrated_db) == [(2, "walk")]
+    for table in ("review_state", "stats_card", "stats_deck"):
+        assert migrated_db.fetch_all(f"SELECT user_id FROM {table}") == [(2,)]
+    assert "czasowniki" in repository.decks["Angielski"]
+    assert [row[1] for row in repository.cards(2, *DECK)] == ["walk"]
+
+
+def test_deck_and_language_go_once_no_cards_reference_them(migrated_db):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, *DECK, "run", "biegać", "")
+    repository.add_card(2, "Angielski", "rzeczowniki", "book", "książka", "")
+
+    assert repository.delete_category(1, "Angielski")
+    assert repository.decks == {"Angielski": {"rzeczowniki": 2}}
+    assert migrated_db.fetch_all("SELECT name FROM decks") == [("rzeczowniki",)]
+
+    assert repository.delete_category(2, "Angielski")
+    assert repository.decks == {}
+    assert migrated_db.fetch_all("SELECT name FROM languages") == []
+    assert card_words(migrated_db) == []
+
+
+def test_deleting_cards_removes_their_review_state_and_stats(migrated_db):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, *DECK, "run", "biegać", "")
+    repository.add_card(1, *DECK, "eat", "jeść", "")
+    add_answers(migrated_db, 1, "run")
+
+    assert repository.delete_cards(1, *DECK, ["run", "missing"])
+
+    assert card_words(migrated_db) == [(1, "eat")]
+    assert migrated_db.fetch_all("SELECT card_id FROM review_state") == []
+    assert migrated_db.fetch_all("SELECT card_id FROM stats_card") == []
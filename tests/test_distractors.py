@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from flashcardCore import DeckRepository, DistractorEngine, QuizSampler, QuizSession, ReviewScheduler
+
+DECK = ("Angielski", "czasowniki")
+
+
+@pytest.fixture(autouse=True)
+def seeded_random():
+    random.seed(1234)
+
+
+def test_options_prefer_similar_translations():
+    engine = DistractorEngine(["biegać", "biegnąć", "pobiegać", "biegacz", "stół", "krzesło", "okno", "drzwi"],
+                              neighbours=3)
+
+    for _ in range(20):
+        options = engine.options("biegać")
+        assert len(options) == 4 and options.count("biegać") == 1
+        assert set(options) - {"biegać"} <= {"biegnąć", "pobiegać", "biegacz"}
+
+
+def test_duplicates_and_blank_translations_are_not_answers():
+    engine = DistractorEngine(["dom", "Dom ", "", None, "kot"])
+
+    assert engine.distinct_count() == 2
+    assert sorted(engine.options("dom")) == ["dom", "kot"]
+
+
+@pytest.mark.parametrize("pool, translation, expected", [
+    (["jeden", "dwa"], "jeden", 2),
+    (["jeden", "dwa", "trzy"], "jeden", 3),
+    (["jeden", "dwa", "trzy", "cztery", "pięć"], "", 4),
+    (["jeden", "dwa", "trzy"], "spoza puli", 4),
+])
+def test_too_small_pool_falls_back_to_fewer_options(pool, translation, expected):
+    engine = DistractorEngine(pool, neighbours=1)
+
+    for _ in range(20):
+        options = engine.options(translation)
+        assert len(options) == expected
+        assert options.count(translation) == 1
+        assert len(set(options)) == expected
+
+
+def test_abcd_quiz_needs_two_distinct_translations(migrated_db):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, *DECK, "run", "biegać", "")
+    repository.add_card(1, *DECK, "sprint", "Biegać", "")
+    session = QuizSession(QuizSampler(migrated_db), ReviewScheduler(migrated_db, 1), writer=None,
+                          mode=QuizSession.MODE_ABCD)
+
+    with pytest.raises(ValueError):
+        session.start([DECK], 5)
+
+    repository.add_card(1, *DECK, "eat", "jeść", "")
+    assert session.start([DECK], 5) == 3
+    card = session.next_question()
+    assert card[2] in session.options and len(session.options) == 2
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from flashcardApp import JobRunner
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def runner(app):
+    runner = JobRunner(max_workers=2)
+    yield runner
+    runner.cancel_all()
+    runner.wait_for_done(5000)
+
+
+# Przetwarza zdarzenia Qt (sygnały z wątków puli, timery), aż warunek się spełni
+def process_events_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+# Atrapa dostawcy (tłumaczenia, zdania) - odpowiada po zadanym czasie
+def slow_provider(delay, result):
+    def provide(*args):
+        time.sleep(delay)
+        return result
+    return provide
+
+
+def test_submit_does_not_block_and_delivers_result(runner):
+    results = []
+    started = time.perf_counter()
+    runner.submit(slow_provider(0.2, "hello"), "hej", on_result=results.append)
+
+    assert time.perf_counter() - started < 0.1
+    assert runner.pending() == 1
+    assert process_events_until(lambda: results)
+    assert results == ["hello"]
+    assert runner.pending() == 0
+
+
+def test_result_is_delivered_on_the_gui_thread(runner):
+    threads = []
+    runner.submit(slow_provider(0.01, "x"), on_result=lambda result: threads.append(threading.current_thread()))
+
+    assert process_events_until(lambda: threads)
+    assert threads == [threading.main_thread()]
+
+
+def test_timeout_fires_and_late_result_is_dropped(runner):
+    results, timeouts = [], []
+    job_id = runner.submit(slow_provider(0.3, "late"), on_result=results.append,
+                           on_timeout=lambda: timeouts.append(True), timeout=0.05)
+
+    assert process_events_until(lambda: timeouts)
+    assert not runner.is_pending(job_id)
+    runner.wait_for_done(5000)
+    process_events_until(lambda: False, timeout=0.1)
+    assert results == []
+
+
+def test_cancelled_job_never_reports(runner):
+    results, errors = [], []
+    job_id = runner.submit(slow_provider(0.2, "x"), on_result=results.append, on_error=errors.append)
+    runner.cancel(job_id)
+
+    assert runner.pending() == 0
+    runner.wait_for_done(5000)
+    process_events_until(lambda: False, timeout=0.1)
+    assert results == [] and errors == []
+
+
+def test_cancel_before_start_skips_the_provider(runner):
+    # Jeden wątek zajęty, więc drugie zadanie czeka w kolejce i zostaje anulowane przed startem
+    calls = []
+    runner.pool.setMaxThreadCount(1)
+    runner.submit(slow_provider(0.2, "busy"))
+    job_id = runner.submit(lambda: calls.append(True))
+    runner.cancel(job_id)
+
+    runner.wait_for_done(5000)
+    assert calls == []
+
+
+def test_provider_error_is_reported(runner):
+    errors = []
+
+    def failing_provider():
+        raise RuntimeError("quota exceeded")
+
+    runner.submit(failing_provider, on_error=errors.append)
+
+    assert process_events_until(lambda: errors)
+    assert errors == ["quota exceeded"]
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from flashcardCore import DECK_ID, MIGRATIONS, DatabaseManager, SchemaMigrator
+
+
+def tables(db):
+    return {row[0] for row in db.fetch_all("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_migrate_twice_is_a_no_op(db):
+    plan = SchemaMigrator(db).migrate()
+    assert [step[0] for step in plan] == [migration[0] for migration in MIGRATIONS]
+
+    assert SchemaMigrator(db).migrate() == []
+    assert SchemaMigrator(db).current_version() == MIGRATIONS[-1][0]
+    assert db.fetch_one("SELECT COUNT(*) FROM schema_version") == (len(MIGRATIONS),)
+
+
+def test_each_step_can_be_reapplied(db):
+    # Awaria po instrukcjach migracji, a przed zapisem wersji - krok wykonuje się ponownie
+    for version, _, _ in MIGRATIONS:
+        migrator = SchemaMigrator(db, [migration for migration in MIGRATIONS if migration[0] <= version])
+        migrator.migrate()
+        db.execute_query("DELETE FROM schema_version WHERE version = %s", (version,))
+        assert [step[0] for step in migrator.migrate()] == [version]
+    assert SchemaMigrator(db).current_version() == MIGRATIONS[-1][0]
+
+
+def test_dry_run_plans_every_step_without_changing_the_database(db):
+    plan = SchemaMigrator(db).migrate(dry_run=True)
+    assert tables(db) == set()
+
+    # Plan kolejnych migracji uwzględnia zmiany wcześniejszych - taki sam jak przy prawdziwym uruchomieniu
+    assert plan == SchemaMigrator(db).migrate()
+    statements = " ".join(" ".join(statement.split()) for _, _, step in plan for statement in step)
+    assert "ADD COLUMN deck_id" in statements
+    assert "DROP COLUMN category" in statements
+
+
+def test_deck_queries_use_indexes(db):
+    SchemaMigrator(db).migrate()
+    deck = ("Angielski", "czasowniki")
+    queries = [
+        (f"SELECT id FROM flashcards WHERE user_id = %s AND deck_id = {DECK_ID} AND word = %s",
+         (1,) + deck + ("run",), "uq_flashcards_user_deck_full_word"),
+        (f"SELECT id FROM flashcards WHERE deck_id = {DECK_ID} AND user_id = %s ORDER BY word, id",
+         deck + (1,), "uq_flashcards_user_deck_full_word"),
+        (f"SELECT id FROM flashcards WHERE deck_id = {DECK_ID} AND user_id = %s ORDER BY translation, id",
+         deck + (1,), "idx_flashcards_deck_full_translation"),
+        (f"SELECT id FROM flashcards WHERE deck_id = {DECK_ID} AND user_id = %s ORDER BY random_key",
+         deck + (1,), "idx_flashcards_deck_id_random"),
+        ("SELECT id FROM quiz_results WHERE user_id = %s ORDER BY date DESC", (1,), "idx_quiz_results_user_date"),
+    ]
+    for query, params, index in queries:
+        plan = " ".join(row[3] for row in db.fetch_all("EXPLAIN QUERY PLAN " + query, params))
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_word_is_unique_within_a_users_deck(db):
+    SchemaMigrator(db).migrate()
+    db.execute_query("INSERT INTO users (username, email, password) VALUES ('ann', 'a@example.com', 'x')")
+    db.execute_query("INSERT INTO languages (name) VALUES ('Angielski')")
+    db.execute_query("INSERT INTO decks (language_id, name) VALUES (1, 'czasowniki')")
+    insert = "INSERT INTO flashcards (deck_id, word, translation, user_id) VALUES (1, %s, 't', 1)"
+    db.execute_query(insert, ("run",))
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction():
+            db.execute_query(insert, ("run",))
+
+
+def test_deck_tables_migration_resumes_after_partial_failure(tmp_path):
+    # MySQL zatwierdza każdą instrukcję DDL osobno - tu każda instrukcja migracji 8 jest zatwierdzana
+    # od razu, a migracja zostaje przerwana po każdej z nich i uruchomiona ponownie
+    path = str(tmp_path / "v7.sqlite")
+    db = DatabaseManager(None, None, None, path, driver="sqlite")
+    SchemaMigrator(db, [migration for migration in MIGRATIONS if migration[0] <= 7]).migrate()
+    db.execute_query("INSERT INTO users (username, email, password) VALUES ('ann', 'a@example.com', 'x')")
+    for category, subcategory, word in [("Angielski", "czasowniki", "run"), ("Angielski", "rzeczowniki", "book"),
+                                        ("Szwedzki", "djur", "hund")]:
+        db.execute_query("INSERT INTO flashcards (category, subcategory, word, translation, user_id, random_key) "
+                         "VALUES (%s, %s, %s, 't', 1, 0.5)", (category, subcategory, word))
+    db.execute_query("INSERT INTO stats_deck (user_id, category, subcategory, answers, correct) "
+                     "VALUES (1, 'Angielski', 'czasowniki', 5, 3), (1, 'Francuski', 'bez fiszek', 2, 1)")
+    statements = MIGRATIONS[7][2](db)
+    db.disconnect()
+    with open(path, "rb") as file:
+        snapshot = file.read()
+
+    def migrated_state(db):
+        return (
+            db.fetch_all("SELECT l.name, d.name, f.word FROM flashcards f JOIN decks d ON d.id = f.deck_id "
+                         "JOIN languages l ON l.id = d.language_id ORDER BY f.word"),
+            db.fetch_all("SELECT l.name, d.name, s.answers FROM stats_deck s JOIN decks d ON d.id = s.deck_id "
+                         "JOIN languages l ON l.id = d.language_id ORDER BY l.name"),
+            sorted(row[0] for row in db.fetch_all("SELECT name FROM pragma_table_info('flashcards')")),
+        )
+
+    expected = (
+        [("Angielski", "rzeczowniki", "book"), ("Szwedzki", "djur", "hund"), ("Angielski", "czasowniki", "run")],
+        [("Angielski", "czasowniki", 5), ("Francuski", "bez fiszek", 2)],
+        ["created_at", "deck_id", "example_sentence", "id", "random_key", "translation", "user_id", "word"],
+    )
+    for applied in range(len(statements) + 1):
+        partial = tmp_path / f"partial_{applied}.sqlite"
+        partial.write_bytes(snapshot)
+        db = DatabaseManager(None, None, None, str(partial), driver="sqlite")
+        for statement in statements[:applied]:
+            assert db.execute_query(statement) is not None
+        SchemaMigrator(db).migrate()
+        assert migrated_state(db) == expected, f"przerwano po {applied} instrukcjach"
+        assert SchemaMigrator(db).migrate() == []
+        db.disconnect()
@@ -0,0 +1,69 @@
+import time
+
+from flashcardCore import DatabaseManager, DeckRepository, ReviewLogWriter
+
+DECK = ("Angielski", "czasowniki")
+
+
+def noon(year, month, day):
+    return time.mktime((year, month, day, 12, 0, 0, 0, 0, -1))
+
+
+def test_upsert_statement_for_each_dialect():
+    updates = [("answers", "answers + NEW.answers"), ("last", "NEW.last")]
+    sqlite = DatabaseManager(None, None, None, ":memory:", driver="sqlite")
+    mysql = DatabaseManager("localhost", "root", "", "talkie")
+
+    assert sqlite.upsert_statement("stats", ["user_id"], ["answers", "last"], updates) == (
+        "INSERT INTO stats (user_id, answers, last) VALUES (%s, %s, %s) "
+        "ON CONFLICT (user_id) DO UPDATE SET answers = answers + excluded.answers, last = excluded.last"
+    )
+    assert mysql.upsert_statement("stats", ["user_id"], ["answers", "last"], updates) == (
+        "INSERT INTO stats (user_id, answers, last) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE answers = answers + VALUES(answers), last = VALUES(last)"
+    )
+    assert mysql.upsert_statement("t", ["a", "b"], ["c"], values={"b": "(SELECT 1)"}) == (
+        "INSERT INTO t (a, b, c) VALUES (%s, (SELECT 1), %s) ON DUPLICATE KEY UPDATE c = VALUES(c)"
+    )
+
+
+def write_answers(db, answers):
+    DeckRepository(db).add_card(1, *DECK, "run", "biegać", "")
+    card_id = db.fetch_one("SELECT id FROM flashcards")[0]
+    writer = ReviewLogWriter(db, flush_interval=60.0)
+    for answered_at, correct in answers:
+        writer.log_answer(1, card_id, DECK, correct, 1000, "open", answered_at)
+    return writer
+
+
+def test_card_and_deck_aggregates_follow_every_answer(migrated_db):
+    # Wynik quizu trafia do statystyk bieżącego dnia, więc odpowiedzi też są z dzisiaj
+    today = time.localtime()
+    day = noon(today.tm_year, today.tm_mon, today.tm_mday)
+    writer = write_answers(migrated_db, [(day, True), (day + 1, True), (day + 2, True), (day + 3, False),
+                                         (day + 4, True)])
+    writer.log_quiz_result(1, 4, 1)
+    assert writer.close()
+
+    assert migrated_db.fetch_one("SELECT answers, correct, streak, best_streak, last_answer_at FROM stats_card") == (
+        5, 4, 1, 3, day + 4
+    )
+    repository = DeckRepository(migrated_db)
+    assert repository.deck_progress(1) == [("Angielski", "czasowniki", 5, 4)]
+    assert repository.daily_progress(1) == ([(time.strftime("%Y-%m-%d", today), 1, 4, 1, 5, 4)], None)
+    assert repository.progress_summary(1) == (1, 4, 1, 5, 4, 1, 1)
+
+
+def test_daily_streak_grows_on_consecutive_days_and_resets_after_a_gap(migrated_db):
+    answers = [(noon(2026, 3, day), True) for day in (1, 1, 2, 3, 5, 6)]
+    assert write_answers(migrated_db, answers).close()
+
+    assert migrated_db.fetch_one("SELECT answers, streak_days, best_streak_days, last_day FROM stats_user") == (
+        6, 2, 3, "2026-03-06"
+    )
+    page, next_day = DeckRepository(migrated_db).daily_progress(1, limit=3)
+    assert [row[0] for row in page] == ["2026-03-06", "2026-03-05", "2026-03-03"]
+    assert next_day == "2026-03-03"
+    page, next_day = DeckRepository(migrated_db).daily_progress(1, before=next_day, limit=3)
+    assert [(row[0], row[4]) for row in page] == [("2026-03-02", 1), ("2026-03-01", 2)]
+    assert next_day is None
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from flashcardCore import QuizSampler, ensure_deck
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def seeded_random():
+    random.seed(42)
+
+
+def add_deck(db, subcategory, size, user_id=1, not_due=0):
+    # Talia z losowymi kluczami; pierwsze not_due fiszek ma powtórkę dopiero w przyszłości
+    deck_id = ensure_deck(db, "Angielski", subcategory)
+    db.execute_many(
+        "INSERT INTO flashcards (deck_id, word, translation, user_id, random_key) VALUES (%s, %s, %s, %s, %s)",
+        [(deck_id, f"{subcategory}{i}", f"t{i}", user_id, random.random()) for i in range(size)]
+    )
+    ids = [row[0] for row in db.fetch_all("SELECT id FROM flashcards WHERE deck_id = %s AND user_id = %s ORDER BY id",
+                                          (deck_id, user_id))]
+    db.execute_many("INSERT INTO review_state (user_id, card_id, due_at) VALUES (%s, %s, %s)",
+                    [(user_id, card_id, NOW + 3600) for card_id in ids[:not_due]])
+    return ("Angielski", subcategory)
+
+
+def test_allocate_by_cards_and_by_decks():
+    sampler = QuizSampler(None)
+
+    assert sampler.allocate([10, 30], 8) == [2, 6]
+    assert sampler.allocate([5, 5, 5], 10) in ([4, 3, 3], [3, 4, 3], [3, 3, 4])
+    assert sampler.allocate([3, 4], 10) == [3, 4]
+    # Po równo - to, czego nie wypełni mała talia, trafia do pozostałych
+    assert sampler.allocate([1, 10, 10], 9, QuizSampler.WEIGHT_DECKS) == [1, 4, 4]
+    assert sum(sampler.allocate([2, 7, 7], 10, QuizSampler.WEIGHT_DECKS)) == 10
+
+
+def test_deck_sizes_are_exact_for_small_decks_and_estimated_for_large(migrated_db):
+    small = add_deck(migrated_db, "small", 20)
+    large = add_deck(migrated_db, "large", 3000)
+    empty = ("Angielski", "brak")
+
+    sizes = QuizSampler(migrated_db).deck_sizes(1, [small, large, empty], sample=64)
+
+    assert sizes[0] == 20 and sizes[2] == 0
+    assert 1500 < sizes[1] < 6000
+    assert QuizSampler(migrated_db).deck_sizes(2, [small]) == [0]
+
+
+def test_sample_returns_distinct_due_cards_from_the_chosen_decks(migrated_db):
+    first = add_deck(migrated_db, "first", 50)
+    second = add_deck(migrated_db, "second", 150)
+    add_deck(migrated_db, "other", 50)
+
+    cards = QuizSampler(migrated_db).sample(1, [first, second], 40, now=NOW)
+
+    assert len(cards) == 40 and len({card[0] for card in cards}) == 40
+    # Rozmiary talii są szacowane, więc podział jest w przybliżeniu proporcjonalny (dokładnie 10 i 30)
+    from_first = sum(card[4] == first for card in cards)
+    assert 4 <= from_first <= 18
+
+
+def test_shortfall_in_one_deck_is_taken_from_the_others(migrated_db):
+    mostly_reviewed = add_deck(migrated_db, "reviewed", 100, not_due=95)
+    fresh = add_deck(migrated_db, "fresh", 100)
+
+    cards = QuizSampler(migrated_db).sample(1, [mostly_reviewed, fresh], 40, now=NOW)
+
+    # Brakujące pytania dobiera druga talia; nadwyżka ponad count jest odrzucana losowo
+    assert len(cards) == 40 and len({card[0] for card in cards}) == 40
+    assert 1 <= sum(card[4] == mostly_reviewed for card in cards) <= 5
+    assert all(card[5] is None for card in cards)
+
+
+def test_count_above_due_cards_returns_every_due_card(migrated_db):
+    deck = add_deck(migrated_db, "deck", 30, not_due=10)
+
+    cards = QuizSampler(migrated_db).sample(1, [deck], 1000, now=NOW)
+
+    assert len(cards) == 20
+
+
+def test_sampled_cards_are_rekeyed(migrated_db):
+    deck = add_deck(migrated_db, "deck", 100)
+    before = dict(migrated_db.fetch_all("SELECT id, random_key FROM flashcards"))
+
+    cards = QuizSampler(migrated_db).sample(1, [deck], 10, now=NOW)
+
+    after = dict(migrated_db.fetch_all("SELECT id, random_key FROM flashcards"))
+    sampled = {card[0] for card in cards}
+    assert all(after[card_id] != before[card_id] for card_id in sampled)
+    assert all(after[card_id] == before[card_id] for card_id in before if card_id not in sampled)
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from flashcardCore import DeckRepository, ReviewLogWriter
+
+DECK = ("Angielski", "czasowniki")
+NOW = 1_000_000.0
+
+
+@pytest.fixture
+def card_id(migrated_db):
+    DeckRepository(migrated_db).add_card(1, *DECK, "run", "biegać", "")
+    return migrated_db.fetch_one("SELECT id FROM flashcards")[0]
+
+
+def logged_answers(db):
+    return db.fetch_one("SELECT COUNT(*) FROM review_log")[0]
+
+
+def gate_transactions(db, monkeypatch):
+    # Wątek zapisujący czeka na otwarcie bramki przy każdej transakcji
+    gate = threading.Event()
+    entered = threading.Event()
+    transaction = db.transaction
+
+    def gated_transaction():
+        entered.set()
+        gate.wait(5)
+        return transaction()
+
+    monkeypatch.setattr(db, "transaction", gated_transaction)
+    return gate, entered
+
+
+def test_close_flushes_everything_queued(migrated_db, card_id):
+    writer = ReviewLogWriter(migrated_db, flush_interval=60.0)
+    for i in range(25):
+        assert writer.log_answer(1, card_id, DECK, i % 2 == 0, 800, "open", NOW + i)
+    writer.log_quiz_result(1, 13, 12)
+
+    assert writer.close()
+
+    assert logged_answers(migrated_db) == 25
+    assert migrated_db.fetch_one("SELECT correct_answers, wrong_answers FROM quiz_results") == (13, 12)
+    assert writer.stats() == {"pending": 0, "written": 25 * 5 + 3, "dropped": 0, "failed": 0}
+    # Po zamknięciu nic już nie trafia do bazy, a ponowne zamknięcie nie czeka
+    assert writer.close()
+
+
+def test_flush_waits_for_rows_submitted_before_it(migrated_db, card_id):
+    writer = ReviewLogWriter(migrated_db, batch_size=4, flush_interval=60.0)
+    for i in range(10):
+        writer.log_answer(1, card_id, DECK, True, None, "abcd", NOW + i)
+
+    assert writer.flush()
+    assert logged_answers(migrated_db) == 10
+    writer.close()
+
+
+def test_full_queue_drops_whole_answers_and_counts_their_rows(migrated_db, card_id, monkeypatch):
+    gate, entered = gate_transactions(migrated_db, monkeypatch)
+    writer = ReviewLogWriter(migrated_db, max_pending=3, flush_interval=60.0)
+    # Pierwszą odpowiedź zabiera wątek zapisujący i czeka przy bramce, kolejne zapełniają kolejkę
+    assert writer.log_answer(1, card_id, DECK, True, 500, "open", NOW)
+    assert entered.wait(5)
+    for i in range(3):
+        assert writer.log_answer(1, card_id, DECK, True, 500, "open", NOW + 1 + i)
+    assert not writer.log_answer(1, card_id, DECK, False, 500, "open", NOW + 10)
+    assert not writer.log_quiz_result(1, 4, 1)
+    assert writer.stats() == {"pending": 3, "written": 0, "dropped": 5 + 3, "failed": 0}
+
+    gate.set()
+    assert writer.close()
+
+    # Odrzucona odpowiedź nie trafiła ani do dziennika, ani do agregatów
+    assert logged_answers(migrated_db) == 4
+    assert migrated_db.fetch_one("SELECT answers, correct FROM stats_card") == (4, 4)
+    assert migrated_db.fetch_one("SELECT answers, correct FROM stats_deck") == (4, 4)
+    assert migrated_db.fetch_one("SELECT quizzes, answers FROM stats_user") == (0, 4)
+
+
+def test_failed_batch_is_retried_row_by_row(migrated_db, card_id):
+    writer = ReviewLogWriter(migrated_db, flush_interval=60.0)
+    insert = "INSERT INTO review_log (user_id, card_id, correct, quiz_mode, answered_at) VALUES (%s, %s, %s, %s, %s)"
+    writer.submit(insert, (1, card_id, 1, "open", NOW))
+    writer.submit(insert, (1, card_id, 1, None, NOW))
+    writer.submit(insert, (1, card_id, 0, "open", NOW))
+
+    assert writer.close()
+
+    assert logged_answers(migrated_db) == 2
+    assert writer.stats()["written"] == 2 and writer.stats()["failed"] == 1
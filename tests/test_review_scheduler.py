@@ -0,0 +1,86 @@
+from flashcardCore import DECK_ID, DeckRepository, QuizSampler, ReviewScheduler, sm2_step
+
+DECK = ("Angielski", "czasowniki")
+OTHER = ("Angielski", "rzeczowniki")
+NOW = 1_000_000.0
+
+
+def add_cards(db, deck, words, user_id=1):
+    repository = DeckRepository(db)
+    for word in words:
+        repository.add_card(user_id, *deck, word, word.upper(), "")
+    return dict(db.fetch_all("SELECT word, id FROM flashcards WHERE user_id = %s", (user_id,)))
+
+
+def set_due(db, card_id, due_at, user_id=1):
+    db.execute_query("INSERT INTO review_state (user_id, card_id, repetitions, due_at) VALUES (%s, %s, 1, %s)",
+                     (user_id, card_id, due_at))
+
+
+def test_sm2_step_resets_on_a_wrong_answer():
+    assert sm2_step(2.5, 0, 0, 4) == (2.5, 1, 1)
+    assert sm2_step(2.5, 1, 1, 4)[1:] == (6, 2)
+    easiness, interval_days, repetitions = sm2_step(2.5, 6, 2, 1)
+    assert (interval_days, repetitions) == (10 / (24 * 60), 0)
+    assert easiness < 2.5
+
+
+def test_due_order_is_new_cards_then_most_overdue(migrated_db):
+    ids = add_cards(migrated_db, DECK, ["a", "b", "c", "d", "e"])
+    set_due(migrated_db, ids["a"], NOW - 10)
+    set_due(migrated_db, ids["b"], NOW - 500)
+    set_due(migrated_db, ids["c"], NOW + 100)
+    ids.update(add_cards(migrated_db, OTHER, ["x"]))
+    set_due(migrated_db, ids["x"], NOW - 1000)
+
+    cards = QuizSampler(migrated_db).sample(1, [DECK], 10, random_order=False, now=NOW)
+
+    assert [card[1] for card in cards] == ["d", "e", "b", "a"]
+    assert cards[2][5][3] == NOW - 500
+    assert cards[0][5] is None
+
+
+def test_due_selection_respects_the_limit(migrated_db):
+    ids = add_cards(migrated_db, DECK, ["a", "b", "c"])
+    for offset, word in enumerate(["a", "b", "c"]):
+        set_due(migrated_db, ids[word], NOW - 100 + offset)
+
+    cards = QuizSampler(migrated_db).sample(1, [DECK], 2, random_order=False, now=NOW)
+
+    assert [card[1] for card in cards] == ["a", "b"]
+
+
+def test_next_due_time_is_the_earliest_review_in_the_chosen_decks(migrated_db):
+    ids = add_cards(migrated_db, DECK, ["a", "b"])
+    ids.update(add_cards(migrated_db, OTHER, ["x"]))
+    set_due(migrated_db, ids["a"], NOW + 300)
+    set_due(migrated_db, ids["b"], NOW + 200)
+    set_due(migrated_db, ids["x"], NOW + 100)
+    sampler = QuizSampler(migrated_db)
+
+    assert sampler.next_due_time(1, [DECK]) == NOW + 200
+    assert sampler.next_due_time(1, [DECK, OTHER]) == NOW + 100
+    assert sampler.next_due_time(2, [DECK]) is None
+    assert sampler.next_due_time(1, []) is None
+
+
+def test_due_queries_seek_the_review_state_index(migrated_db):
+    query = f"""
+    SELECT f.id FROM review_state rs JOIN flashcards f ON f.id = rs.card_id
+    WHERE rs.user_id = %s AND rs.due_at <= %s AND f.deck_id = {DECK_ID}
+    ORDER BY rs.due_at LIMIT %s
+    """
+    plan = " ".join(row[3] for row in migrated_db.fetch_all("EXPLAIN QUERY PLAN " + query, (1, NOW) + DECK + (10,)))
+    assert "idx_review_state_user_due" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_record_review_schedules_the_next_review(migrated_db):
+    ids = add_cards(migrated_db, DECK, ["a"])
+    scheduler = ReviewScheduler(migrated_db, 1)
+    scheduler.track(ids["a"], DECK)
+
+    scheduler.record_review(ids["a"], True, now=NOW)
+
+    assert migrated_db.fetch_one("SELECT repetitions, due_at, last_review FROM review_state") == (1, NOW + 24 * 3600, NOW)
+    assert QuizSampler(migrated_db).sample(1, [DECK], 5, random_order=False, now=NOW) == []
@@ -0,0 +1,31 @@
+from flashcardCore import DeckRepository
+
+
+def test_search_scope_and_suggestions(migrated_db):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, "Angielski", "czasowniki", "run", "biegać", "")
+    repository.add_card(1, "Angielski", "rzeczowniki", "runner", "biegacz", "")
+    repository.add_card(2, "Angielski", "czasowniki", "rust", "rdza", "")
+    engine = repository.search_engine
+
+    assert [card[2] for card in engine.search(1, "run", "Angielski", "czasowniki")] == ["run"]
+    assert [card[:3] for card in engine.search(1, "run")] == [
+        ("Angielski", "czasowniki", "run"), ("Angielski", "rzeczowniki", "runner")
+    ]
+    assert {card[2] for card in engine.search(1, "biegac")} == {"run", "runner"}
+    assert engine.suggest(1, "Ru") == ["run", "runner"]
+    assert engine.suggest(1, " ") == []
+
+
+def test_search_index_follows_repository_writes(migrated_db):
+    repository = DeckRepository(migrated_db)
+    repository.add_card(1, "Angielski", "czasowniki", "run", "biegać", "")
+    engine = repository.search_engine
+    assert engine.search(1, "run")
+
+    repository.update_card(1, "Angielski", "czasowniki", "run", "sprint", "biegać", "")
+    assert engine.search(1, "run") == []
+    assert engine.suggest(1, "spr") == ["sprint"]
+
+    repository.delete_card(1, "Angielski", "czasowniki", "sprint")
+    assert engine.search(1, "sprint") == []
@@ -0,0 +1,98 @@
+import json
+import re
+import threading
+import time
+
+from flashcardCore import SentenceGenerator
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+# Atrapa modelu Gemini: odpowiedź na zapytanie wsadowe buduje funkcja batch_reply(słowa),
+# a na zapytanie o jedno słowo odpowiada "single <słowo>"
+class FakeModel:
+    def __init__(self, batch_reply, delay=0.0):
+        self.batch_reply = batch_reply
+        self.delay = delay
+        self.batch_calls = []
+        self.single_calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            batch = re.search(r"Words: (\[.*\])", prompt)
+            with self._lock:
+                if batch:
+                    words = json.loads(batch.group(1))
+                    self.batch_calls.append(words)
+                else:
+                    word = re.search(r"the word '(.*?)'", prompt).group(1)
+                    self.single_calls.append(word)
+            if batch:
+                return FakeResponse(self.batch_reply(words))
+            return FakeResponse(f"single {word}")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_parse_batch_response_accepts_fenced_json():
+    text = '```json\n{"hund": "Der Hund bellt.", "katze": "Die Katze schläft."}\n```'
+    assert SentenceGenerator.parse_batch_response(text) == {"hund": "Der Hund bellt.", "katze": "Die Katze schläft."}
+
+
+def test_parse_batch_response_ignores_text_around_the_object():
+    assert SentenceGenerator.parse_batch_response('Sure! {"a": "A."} Hope it helps.') == {"a": "A."}
+    assert SentenceGenerator.parse_batch_response("no json here") == {}
+    assert SentenceGenerator.parse_batch_response('["not", "an", "object"]') == {}
+
+
+def test_batch_sends_one_prompt_per_chunk():
+    model = FakeModel(lambda words: json.dumps({word: f"Batch {word}" for word in words}))
+    generator = SentenceGenerator(model=model, batch_size=3)
+
+    results = generator.generate_batch(["a", "b", "c", "d", "", "a"], "angielski")
+
+    assert results == {"a": "Batch a.", "b": "Batch b.", "c": "Batch c.", "d": "Batch d."}
+    assert sorted(map(tuple, model.batch_calls)) == [("a", "b", "c"), ("d",)]
+    assert model.single_calls == []
+
+
+def test_missing_or_invalid_items_fall_back_to_single_word_calls():
+    # "b" pominięte, "c" nie jest napisem, "D" różni się wielkością liter i spacjami
+    model = FakeModel(lambda words: json.dumps({"a": "Sentence a", "c": 3, " d ": "Sentence d"}))
+    generator = SentenceGenerator(model=model)
+
+    results = generator.generate_batch(["a", "b", "c", "D"], "angielski")
+
+    assert results == {"a": "Sentence a.", "b": "single b.", "c": "single c.", "D": "Sentence d."}
+    assert sorted(model.single_calls) == ["b", "c"]
+
+
+def test_unparseable_response_falls_back_for_every_word():
+    model = FakeModel(lambda words: "{not json")
+    generator = SentenceGenerator(model=model)
+
+    results = generator.generate_batch(["a", "b"], "angielski")
+
+    assert results == {"a": "single a.", "b": "single b."}
+    assert sorted(model.single_calls) == ["a", "b"]
+
+
+def test_in_flight_requests_are_capped():
+    model = FakeModel(lambda words: json.dumps({word: word for word in words}), delay=0.05)
+    generator = SentenceGenerator(model=model, batch_size=1, max_in_flight=2)
+
+    results = generator.generate_batch([f"w{i}" for i in range(8)], "angielski")
+
+    assert len(results) == 8
+    assert model.max_in_flight == 2
@@ -0,0 +1,48 @@
+import json
+import sqlite3
+
+import pytest
+
+from flashcardCore import SentenceStore, run_cli
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SentenceStore(str(tmp_path / "sentences.db"))
+    yield store
+    store.close()
+
+
+def test_failed_insert_rolls_back_and_keeps_the_connection_usable(store):
+    store.connection.execute("CREATE TRIGGER reject BEFORE INSERT ON sentences WHEN NEW.word = 'boom' "
+                             "BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        store.add_many([("cat", "angielski", "The cat sleeps."), ("boom", "angielski", "Boom.")])
+
+    assert not store.connection.in_transaction
+    assert store.get_all("cat", "angielski") == []
+    store.add("cat", "Angielski", "The cat sleeps.")
+    assert store.get_all("Cat", "angielski") == ["The cat sleeps."]
+
+
+def test_sentences_rotate_by_last_served(store):
+    store.add_many([("dog", "angielski", "One."), ("dog", "angielski", "Two."), ("dog", "angielski", "One.")])
+
+    assert [store.get("dog", "angielski") for _ in range(3)] == ["One.", "Two.", "One."]
+
+
+def test_import_sentences_command(tmp_path, capsys):
+    path = tmp_path / "zdania.json"
+    path.write_text(json.dumps({"hund": {"szwedzki": ["En hund.", "Hunden sover."]}}), encoding="utf-8")
+    store_path = str(tmp_path / "sentences.db")
+
+    assert run_cli(["import-sentences", str(path), "--store", store_path]) == 0
+    assert "Wczytano 2 zdań" in capsys.readouterr().out
+    store = SentenceStore(store_path)
+    try:
+        assert store.get_all("hund", "szwedzki") == ["En hund.", "Hunden sover."]
+    finally:
+        store.close()
+
+    assert run_cli(["import-sentences", str(tmp_path / "brak.json"), "--store", store_path]) == 1
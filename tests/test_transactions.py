@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def items(db):
+    db.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    return db
+
+
+def names(db):
+    return [row[0] for row in db.fetch_all("SELECT name FROM items ORDER BY id")]
+
+
+def test_failed_inner_block_rolls_back_only_its_savepoint(items):
+    with items.transaction():
+        items.execute_query("INSERT INTO items (name) VALUES ('a')")
+        with pytest.raises(sqlite3.IntegrityError):
+            with items.transaction():
+                items.execute_query("INSERT INTO items (name) VALUES ('b')")
+                items.execute_query("INSERT INTO items (name) VALUES ('a')")
+        assert items.in_transaction()
+        items.execute_query("INSERT INTO items (name) VALUES ('c')")
+
+    assert names(items) == ["a", "c"]
+    assert not items.in_transaction()
+
+
+def test_inner_exception_rolls_back_nested_savepoints(items):
+    with items.transaction():
+        items.execute_query("INSERT INTO items (name) VALUES ('a')")
+        with pytest.raises(ValueError):
+            with items.transaction():
+                items.execute_query("INSERT INTO items (name) VALUES ('b')")
+                with items.transaction():
+                    items.execute_query("INSERT INTO items (name) VALUES ('c')")
+                raise ValueError("anuluj")
+        # Po wycofaniu punktu zapisu kolejny zagnieżdżony blok działa normalnie
+        with items.transaction():
+            items.execute_query("INSERT INTO items (name) VALUES ('d')")
+
+    assert names(items) == ["a", "d"]
+
+
+def test_outer_failure_rolls_back_released_savepoints(items):
+    with pytest.raises(RuntimeError):
+        with items.transaction():
+            items.execute_query("INSERT INTO items (name) VALUES ('a')")
+            with items.transaction():
+                items.execute_query("INSERT INTO items (name) VALUES ('b')")
+            raise RuntimeError("błąd po zagnieżdżonym bloku")
+
+    assert names(items) == []
+    assert not items.in_transaction()
+    stats = items.pool_stats()
+    assert stats["idle"] == stats["open"]
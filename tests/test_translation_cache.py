@@ -0,0 +1,107 @@
+import pytest
+
+from flashcardCore import TranslationCache, TranslationService
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("flashcardCore.time.time", clock)
+    return clock
+
+
+def make_cache(tmp_path, **options):
+    return TranslationCache(str(tmp_path / "translations.db"), **options)
+
+
+def test_lookup_is_normalized_and_counted(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put("  Dobry   Dzień ", "pl", "en", "Good day")
+
+    assert cache.get("dobry dzień", "pl", "en") == "Good day"
+    assert cache.get("dobry dzień", "pl", "de") is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5}
+    cache.close()
+
+
+def test_expired_entry_is_a_miss_and_is_removed(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl=60)
+    cache.put("kot", "pl", "en", "cat")
+
+    clock.now += 59
+    assert cache.get("kot", "pl", "en") == "cat"
+    clock.now += 2
+    assert cache.get("kot", "pl", "en") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.connection.execute("SELECT COUNT(*) FROM translations").fetchone() == (0,)
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted_in_batches(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=10)
+    for i in range(10):
+        clock.now += 1
+        cache.put(f"słowo {i}", "pl", "en", f"word {i}")
+    # Odczyt odświeża wpis, więc nie zostanie usunięty jako pierwszy
+    clock.now += 1
+    assert cache.get("słowo 0", "pl", "en") == "word 0"
+
+    clock.now += 1
+    cache.put("słowo 10", "pl", "en", "word 10")
+
+    # Po przekroczeniu limitu zostaje 90% wpisów - usunięte są dwa najdawniej używane
+    assert cache.stats()["entries"] == 9
+    assert cache.stats()["evictions"] == 2
+    assert cache.get("słowo 1", "pl", "en") is None
+    assert cache.get("słowo 2", "pl", "en") is None
+    assert cache.get("słowo 0", "pl", "en") == "word 0"
+    assert cache.get("słowo 10", "pl", "en") == "word 10"
+    cache.close()
+
+
+def test_entries_survive_reopening(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put("pies", "pl", "en", "dog")
+    cache.close()
+
+    cache = make_cache(tmp_path)
+    assert cache.stats()["entries"] == 1
+    assert cache.get("pies", "pl", "en") == "dog"
+    cache.close()
+
+
+class FakeTranslator:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        return self.result
+
+
+def test_service_asks_the_translator_only_on_a_miss(tmp_path, clock):
+    service = TranslationService(make_cache(tmp_path))
+    translator = service._translators[("auto", "en")] = FakeTranslator("house")
+
+    assert service.translate("dom", "en") == "house"
+    assert service.translate("Dom", "en") == "house"
+    assert translator.calls == ["dom"]
+    service.cache.close()
+
+
+def test_failed_translation_returns_the_text_and_is_not_cached(tmp_path, clock):
+    service = TranslationService(make_cache(tmp_path))
+    service._translators[("auto", "en")] = FakeTranslator("")
+
+    assert service.translate("dom", "en") == "dom"
+    assert service.cache.stats()["entries"] == 0
+    service.cache.close()